@@ -8,7 +8,11 @@
 #include <chrono>
 #include <atomic>
 #include <sys/socket.h>
+#include <sys/epoll.h>
+#include <sys/eventfd.h>
+#include <sys/uio.h>
 #include <netinet/in.h>
+#include <netinet/tcp.h>
 #include <arpa/inet.h>
 #include <unistd.h>
 #include <errno.h>
@@ -16,30 +20,80 @@
 
 using namespace std;
 
+/* Socket and identity of a connected client, shared by the event loop and queued messages */
+class ClientConnection
+{
+private:
+    int socketFd;
+    std::string clientId;
+    std::string logPrefix; // "[clientId][", built once instead of per logged message
+    std::atomic<bool> open{true};
+    std::string pendingInput; // Partial line awaiting its newline, only touched by the event loop
+
+public:
+    ClientConnection(int socketFd, std::string clientId)
+        : socketFd(socketFd), clientId(std::move(clientId)),
+          logPrefix("[" + this->clientId + "][") {}
+
+    // The descriptor is only released once no queued message refers to it,
+    // so the consumer can never send an ACK to a reused fd
+    ~ClientConnection() { close(socketFd); }
+
+    ClientConnection(const ClientConnection &) = delete;
+    ClientConnection &operator=(const ClientConnection &) = delete;
+
+    int getSocket() const { return socketFd; }
+    const std::string &getClientId() const { return clientId; }
+    const std::string &getLogPrefix() const { return logPrefix; }
+    bool isOpen() const { return open; }
+    std::string &getPendingInput() { return pendingInput; }
+
+    // Wakes any blocked recv() and stops further ACKs to this client
+    void markClosed()
+    {
+        if (open.exchange(false))
+            shutdown(socketFd, SHUT_RDWR);
+    }
+};
+
 /* Structure of message */
 class Message
 {
 private:
-    std::string clientId;
+    std::shared_ptr<ClientConnection> connection;
     long long timestamp;
     std::string text;
     int priority;
+    unsigned long long sequence; // Creation order, breaks timestamp ties
+
+    static inline std::atomic<unsigned long long> nextSequence{0};
 
 public:
-    Message(std::string clientId, long long timestamp, std::string text, int priority)
-        : clientId(std::move(clientId)), timestamp(timestamp),
-          text(std::move(text)), priority(priority) {}
+    Message(std::shared_ptr<ClientConnection> connection, long long timestamp, std::string text, int priority)
+        : connection(std::move(connection)), timestamp(timestamp),
+          text(std::move(text)), priority(priority), sequence(nextSequence++) {}
 
-    const std::string &getClientId() const { return clientId; }
+    const std::shared_ptr<ClientConnection> &getConnection() const { return connection; }
+    const std::string &getClientId() const { return connection->getClientId(); }
     const int getPriority() const { return priority; }
     const long long getTimestamp() const { return timestamp; }
     const std::string &getText() const { return text; }
+    unsigned long long getSequence() const { return sequence; }
+
+    // Appends "[clientId][timestamp][text][priority]" to out without a stringstream
+    void appendTo(std::string &out) const
+    {
+        out.append(connection->getLogPrefix());
+        out.append(std::to_string(timestamp)).append("][");
+        out.append(text).append("][");
+        out.append(std::to_string(priority)).append("]");
+    }
 
     const std::string toString() const
     {
-        std::stringstream ss;
-        ss << "[" << clientId << "][" << timestamp << "][" << text << "][" << priority << "]";
-        return ss.str();
+        std::string out;
+        appendTo(out);
+        return out;
     }
 };
 
@@ -52,7 +106,11 @@ public:
     {
         if (a->getPriority() != b->getPriority())
             return a->getPriority() < b->getPriority();
-        return a->getTimestamp() > b->getTimestamp();
+        // Lines split out of one read share a timestamp, so fall back to
+        // creation order to keep them FIFO
+        if (a->getTimestamp() != b->getTimestamp())
+            return a->getTimestamp() > b->getTimestamp();
+        return a->getSequence() > b->getSequence();
     }
 };
 
@@ -79,6 +137,27 @@ public:
         queueConditionalVariable.notify_one();
     }
 
+    // Moves every message in messages into the queue under a single lock and
+    // leaves messages empty (with its capacity) for reuse
+    void pushBatch(std::vector<std::unique_ptr<Message>> &messages) noexcept
+    {
+        if (messages.empty())
+            return;
+
+        {
+            std::lock_guard<std::mutex> lock(queueMutex);
+            if (!shutdown) // Don't accept new messages during shutdown
+            {
+                for (auto &msg : messages)
+                {
+                    queue.push(std::move(msg));
+                }
+            }
+        }
+        messages.clear();
+        queueConditionalVariable.notify_one();
+    }
+
     std::unique_ptr<Message> pop()
     {
         std::unique_lock<std::mutex> lock(queueMutex);
@@ -95,6 +174,23 @@ public:
         return msg;
     }
 
+    // Pops up to maxCount messages in priority order under a single lock.
+    // An empty batch signals shutdown.
+    std::vector<std::unique_ptr<Message>> popBatch(size_t maxCount)
+    {
+        std::vector<std::unique_ptr<Message>> batch;
+        std::unique_lock<std::mutex> lock(queueMutex);
+        queueConditionalVariable.wait(lock, [this]()
+                                      { return !queue.empty() || shutdown; });
+
+        while (!queue.empty() && batch.size() < maxCount)
+        {
+            batch.push_back(std::move(const_cast<std::unique_ptr<Message> &>(queue.top())));
+            queue.pop();
+        }
+        return batch;
+    }
+
     size_t size() const
     {
         std::lock_guard<std::mutex> lock(queueMutex);
@@ -113,140 +209,452 @@ public:
 
 ThreadSafePriorityQueue messageQueue;
 
-// Map individual clients to their sockets
-std::unordered_map<std::string, int> clientSocketMap;
-std::mutex socketMapMutex;
-
 // Generate unique client IDs
 std::atomic<int> clientCounter{0};
 
 // Server running flag
 std::atomic<bool> isServerRunning{true};
 
+// Written by the signal handler to wake every event loop, so none of them has to poll.
+// It is never drained, so it stays readable for all loops once shutdown starts.
+int shutdownEventFd = -1;
+volatile sig_atomic_t receivedSignal = 0;
+
+// Fixed parts of every ACK, shared by every ACK instead of copied per message
+static const std::string ACK_PREFIX = "Received: ";
+static const std::string ACK_SUFFIX = "\n";
+
+// Messages drained from the queue per wakeup; their ACKs are coalesced into one send() per client
+constexpr size_t ACK_BATCH_SIZE = 32;
+
+// Longest message text, matching the original 1024-byte read buffer; longer
+// lines are queued as several messages of at most this size
+constexpr size_t MAX_MESSAGE_SIZE = 1023;
+
+// Size of the event loop's receive buffer, shared by every client read
+constexpr size_t READ_BUFFER_SIZE = 64 * 1024;
+
+// Connections taken off the accept queue per wakeup, so a connect burst is
+// drained quickly without one loop taking every client
+constexpr int MAX_ACCEPTS_PER_WAKEUP = 16;
+
+// Longest the consumer blocks on one client's ACKs before giving up on that client
+constexpr int ACK_SEND_TIMEOUT_MS = 500;
+
+// Kernel send/receive buffer size for client sockets, inherited from the listening socket
+constexpr int SOCKET_BUFFER_SIZE = 1 << 20;
+
+// Points an iovec at a string without copying it; sendmsg() never writes through it
+iovec toIovec(const std::string &str)
+{
+    return iovec{const_cast<char *>(str.data()), str.size()};
+}
+
+// Writes every buffer in iov with as few sendmsg() calls as possible,
+// resuming after partial writes. Returns false on a send error.
+bool sendGathered(int socketFd, std::vector<iovec> &iov)
+{
+    size_t first = 0;
+    while (first < iov.size())
+    {
+        msghdr header{};
+        header.msg_iov = iov.data() + first;
+        header.msg_iovlen = std::min<size_t>(iov.size() - first, IOV_MAX);
+
+        ssize_t sent = sendmsg(socketFd, &header, MSG_NOSIGNAL);
+        if (sent < 0)
+        {
+            if (errno == EINTR)
+                continue;
+            return false;
+        }
+
+        // Skip fully written buffers and trim a partially written one
+        while (first < iov.size() && static_cast<size_t>(sent) >= iov[first].iov_len)
+        {
+            sent -= iov[first].iov_len;
+            ++first;
+        }
+        if (sent > 0)
+        {
+            iov[first].iov_base = static_cast<char *>(iov[first].iov_base) + sent;
+            iov[first].iov_len -= sent;
+        }
+    }
+    return true;
+}
+
 /* CONSUMER THREAD */
 void consumerThread()
 {
     std::cout << "Consumer thread started" << std::endl;
 
-    while (isServerRunning)
+    // Scatter/gather list of ACK pieces per client in the current batch. Each ACK
+    // points at the shared prefix/suffix and the message text, so nothing is concatenated.
+    // The vectors keep their capacity between batches.
+    std::vector<std::pair<ClientConnection *, std::vector<iovec>>> acks;
+
+    // Log lines for the whole batch, written and flushed once
+    std::string log;
+
+    // Runs until the queue reports shutdown, which only happens once it is
+    // drained, so messages accepted before Ctrl+C still get their ACKs
+    while (true)
     {
-        auto msg = messageQueue.pop();
+        auto batch = messageQueue.popBatch(ACK_BATCH_SIZE);
 
-        if (!msg)
+        if (batch.empty())
         {
-            // nullptr means shutdown signal
+            // Empty batch means shutdown signal
             std::cout << "Consumer thread shutting down" << std::endl;
             break;
         }
 
-        std::cout << msg->toString() << std::endl;
-
-        std::string clientId = msg->getClientId();
-        int clientSocket = -1;
+        size_t clientsInBatch = 0;
+        log.clear();
 
+        for (const auto &msg : batch)
         {
-            std::lock_guard<std::mutex> lock(socketMapMutex);
-            if (clientSocketMap.count(clientId))
+            msg->appendTo(log);
+            log.push_back('\n');
+
+            ClientConnection *connection = msg->getConnection().get();
+
+            if (!connection->isOpen())
             {
-                clientSocket = clientSocketMap[clientId];
+                log.append("Client socket not found for ").append(msg->getClientId()).push_back('\n');
+                continue;
             }
-        }
 
-        if (clientSocket != -1)
-        {
-            std::string ack = "Received: " + msg->getText() + "\n";
-            ssize_t sent = send(clientSocket, ack.c_str(), ack.size(), 0);
-            if (sent < 0)
+            size_t slot = 0;
+            while (slot < clientsInBatch && acks[slot].first != connection)
+            {
+                ++slot;
+            }
+
+            if (slot == clientsInBatch)
             {
-                std::cerr << "Failed to send ACK to " << clientId << std::endl;
+                if (slot == acks.size())
+                {
+                    acks.emplace_back();
+                }
+                acks[slot].first = connection;
+                acks[slot].second.clear();
+                ++clientsInBatch;
             }
+
+            auto &iov = acks[slot].second;
+            iov.push_back(toIovec(ACK_PREFIX));
+            iov.push_back(toIovec(msg->getText()));
+            iov.push_back(toIovec(ACK_SUFFIX));
         }
-        else
+
+        std::cout << log << std::flush;
+
+        // The batch still owns every connection and message text, so these pointers are valid here
+        for (size_t slot = 0; slot < clientsInBatch; ++slot)
         {
-            std::cout << "Client socket not found for " << clientId << std::endl;
+            ClientConnection *connection = acks[slot].first;
+            if (!sendGathered(connection->getSocket(), acks[slot].second))
+            {
+                std::cerr << "Failed to send ACK to " << connection->getClientId() << ": " << strerror(errno) << std::endl;
+
+                // Timed out or broken: drop the client rather than stall every later batch on it
+                connection->markClosed();
+            }
         }
     }
 
     std::cout << "Consumer thread exited" << std::endl;
 }
 
-void workerThread(int clientSocket, std::string clientId)
+// Connections owned by the event loop, keyed by socket fd
+using ConnectionMap = std::unordered_map<int, std::shared_ptr<ClientConnection>>;
+
+// Returns false once the accept queue is empty
+bool acceptClient(int serverSocket, int epollFd, ConnectionMap &connections)
 {
-    std::cout << "Worker thread started for " << clientId << std::endl;
-    char buffer[1024];
+    int clientSocket = accept4(serverSocket, nullptr, nullptr, SOCK_CLOEXEC);
 
-    while (isServerRunning)
+    if (clientSocket < 0)
     {
-        memset(buffer, 0, sizeof(buffer));
+        if (errno != EAGAIN && errno != EWOULDBLOCK && errno != EINTR && isServerRunning)
+        {
+            std::cerr << "Error accepting connection: " << strerror(errno) << std::endl;
+        }
+        return false;
+    }
+
+    std::string clientId = "client-" + std::to_string(clientCounter++);
+
+    // ACKs are small and latency-sensitive; don't let Nagle hold them back
+    int noDelay = 1;
+    if (setsockopt(clientSocket, IPPROTO_TCP, TCP_NODELAY, &noDelay, sizeof(noDelay)) < 0)
+    {
+        std::cerr << "Failed to set TCP_NODELAY for " << clientId << ": " << strerror(errno) << std::endl;
+    }
+
+    // Set once here rather than around each send: a client that stops reading
+    // can then stall the consumer for at most this long
+    timeval sendTimeout{};
+    sendTimeout.tv_sec = ACK_SEND_TIMEOUT_MS / 1000;
+    sendTimeout.tv_usec = (ACK_SEND_TIMEOUT_MS % 1000) * 1000;
+    if (setsockopt(clientSocket, SOL_SOCKET, SO_SNDTIMEO, &sendTimeout, sizeof(sendTimeout)) < 0)
+    {
+        std::cerr << "Failed to set send timeout for " << clientId << ": " << strerror(errno) << std::endl;
+    }
 
-        int bytes = recv(clientSocket, buffer, sizeof(buffer) - 1, 0);
+    auto connection = std::make_shared<ClientConnection>(clientSocket, clientId);
 
-        if (bytes > 0)
+    epoll_event event{};
+    event.events = EPOLLIN | EPOLLRDHUP;
+    event.data.fd = clientSocket;
+    if (epoll_ctl(epollFd, EPOLL_CTL_ADD, clientSocket, &event) < 0)
+    {
+        std::cerr << "Failed to watch " << clientId << ": " << strerror(errno) << std::endl;
+        return true; // connection goes out of scope and closes the socket
+    }
+
+    connections[clientSocket] = std::move(connection);
+    std::cout << "New connection: " << clientId << std::endl;
+    return true;
+}
+
+// Monotonic, so FIFO ordering of equal-priority messages survives wall-clock adjustments
+long long monotonicNanos()
+{
+    return std::chrono::duration_cast<std::chrono::nanoseconds>(
+               std::chrono::steady_clock::now().time_since_epoch())
+        .count();
+}
+
+// Builds a message for text and collects it for the event loop's next pushBatch()
+void queueMessage(const std::shared_ptr<ClientConnection> &connection, long long ts, std::string text,
+                  std::vector<std::unique_ptr<Message>> &messages)
+{
+    messages.push_back(std::make_unique<Message>(connection, ts, std::move(text), 1));
+}
+
+// Reads whatever is pending on a readable client into the loop's shared buffer
+// and queues one message per newline-terminated line, so a client may send
+// several messages in one write. Returns false once the client is gone.
+bool readFromClient(const std::shared_ptr<ClientConnection> &connection, char *buffer, size_t bufferSize,
+                    std::vector<std::unique_ptr<Message>> &messages)
+{
+    const std::string &clientId = connection->getClientId();
+    std::string &pending = connection->getPendingInput();
+
+    // The socket stays blocking for the consumer's send(), so only this read is non-blocking
+    ssize_t bytes = recv(connection->getSocket(), buffer, bufferSize, MSG_DONTWAIT);
+
+    if (bytes > 0)
+    {
+        std::cout << "Received " << bytes << " bytes from " << clientId << std::endl;
+
+        // One clock read per recv; lines from the same read share it and keep
+        // their order through the message sequence number
+        long long ts = monotonicNanos();
+
+        // Lines are cut straight out of the buffer; only a trailing partial
+        // line is copied into the connection to wait for the rest. pending
+        // never exceeds MAX_MESSAGE_SIZE; it only reaches it when a read ends
+        // right at the cap and the next byte could still be the line's '\n'.
+        const char *cursor = buffer;
+        const char *end = buffer + bytes;
+        while (cursor < end)
         {
-            std::cout << "Received " << bytes << " bytes from " << clientId << std::endl;
+            const char *newline = static_cast<const char *>(memchr(cursor, '\n', end - cursor));
+            const char *lineEnd = newline ? newline : end;
 
-            std::string text(buffer, bytes);
+            // Take no more than still fits in the current message
+            size_t room = MAX_MESSAGE_SIZE - pending.size();
+            const char *pieceEnd = cursor + std::min<size_t>(lineEnd - cursor, room);
 
-            // Remove trailing newline if present
-            if (!text.empty() && text.back() == '\n')
+            if (pieceEnd == newline)
+            {
+                if (pending.empty())
+                {
+                    queueMessage(connection, ts, std::string(cursor, pieceEnd), messages);
+                }
+                else
+                {
+                    pending.append(cursor, pieceEnd);
+                    queueMessage(connection, ts, std::move(pending), messages);
+                    pending.clear();
+                }
+                cursor = newline + 1;
+            }
+            else if (static_cast<size_t>(pieceEnd - cursor) == room && pieceEnd < end)
             {
-                text.pop_back();
+                // Line is longer than a message, and the byte after the cap is known
+                // not to be its newline: queue what fits, continue with the rest
+                pending.append(cursor, pieceEnd);
+                queueMessage(connection, ts, std::move(pending), messages);
+                pending.clear();
+                cursor = pieceEnd;
             }
+            else
+            {
+                pending.append(cursor, pieceEnd);
+                cursor = pieceEnd;
+            }
+        }
+        return true;
+    }
 
-            long long ts = std::chrono::duration_cast<std::chrono::microseconds>(
-                               std::chrono::system_clock::now().time_since_epoch())
-                               .count();
+    if (bytes == 0)
+    {
+        std::cout << "Client disconnected: " << clientId << std::endl;
 
-            auto msg = std::make_unique<Message>(clientId, ts, text, 1);
-            messageQueue.push(std::move(msg));
+        // Don't drop a final line that was sent without a newline
+        if (!pending.empty())
+        {
+            queueMessage(connection, monotonicNanos(), std::move(pending), messages);
+            pending.clear();
         }
-        else if (bytes == 0)
+        return false;
+    }
+
+    if (errno == EAGAIN || errno == EWOULDBLOCK || errno == EINTR)
+    {
+        return true; // Spurious wakeup or interrupted by signal, wait for next event
+    }
+
+    std::cerr << "Read error from " << clientId << ": " << strerror(errno) << std::endl;
+
+    // The socket is broken, so no queued ACK can reach it either
+    connection->markClosed();
+    return false;
+}
+
+/* EVENT LOOP */
+// Accepts clients and reads from all of them on one thread instead of a thread per client.
+// One loop runs per core; they share the listening socket but each owns its own clients.
+void eventLoop(int serverSocket)
+{
+    int epollFd = epoll_create1(EPOLL_CLOEXEC);
+    if (epollFd < 0)
+    {
+        std::cerr << "epoll_create1 failed: " << strerror(errno) << std::endl;
+        return;
+    }
+
+    // EPOLLEXCLUSIVE wakes a single loop per incoming connection instead of all of them
+    epoll_event listenEvent{};
+    listenEvent.events = EPOLLIN | EPOLLEXCLUSIVE;
+    listenEvent.data.fd = serverSocket;
+    if (epoll_ctl(epollFd, EPOLL_CTL_ADD, serverSocket, &listenEvent) < 0)
+    {
+        std::cerr << "Failed to watch server socket: " << strerror(errno) << std::endl;
+        close(epollFd);
+        return;
+    }
+
+    epoll_event wakeEvent{};
+    wakeEvent.events = EPOLLIN;
+    wakeEvent.data.fd = shutdownEventFd;
+    if (epoll_ctl(epollFd, EPOLL_CTL_ADD, shutdownEventFd, &wakeEvent) < 0)
+    {
+        std::cerr << "Failed to watch shutdown event: " << strerror(errno) << std::endl;
+        close(epollFd);
+        return;
+    }
+
+    ConnectionMap connections;
+    std::vector<epoll_event> events(64);
+    std::vector<char> readBuffer(READ_BUFFER_SIZE);
+
+    // Messages read during one wakeup, queued together with a single lock
+    std::vector<std::unique_ptr<Message>> readMessages;
+
+    while (isServerRunning)
+    {
+        // No timeout: shutdown arrives as an event on shutdownEventFd
+        int ready = epoll_wait(epollFd, events.data(), static_cast<int>(events.size()), -1);
+
+        if (ready < 0)
         {
-            std::cout << "Client disconnected: " << clientId << std::endl;
+            if (errno == EINTR)
+            {
+                continue; // Interrupted by signal, re-check isServerRunning
+            }
+            std::cerr << "epoll_wait failed: " << strerror(errno) << std::endl;
             break;
         }
-        else
+
+        for (int i = 0; i < ready; ++i)
         {
-            if (errno == EAGAIN || errno == EWOULDBLOCK)
+            int fd = events[i].data.fd;
+
+            if (fd == shutdownEventFd)
+            {
+                break; // isServerRunning is already false
+            }
+
+            if (fd == serverSocket)
             {
+                int accepted = 0;
+                while (accepted < MAX_ACCEPTS_PER_WAKEUP && acceptClient(serverSocket, epollFd, connections))
+                {
+                    ++accepted;
+                }
                 continue;
             }
 
-            if (errno == EINTR)
+            auto it = connections.find(fd);
+            if (it == connections.end())
             {
-                continue; // Interrupted by signal, retry
+                continue;
             }
 
-            std::cerr << "Read error from " << clientId << ": " << strerror(errno) << std::endl;
-            break;
+            if (!readFromClient(it->second, readBuffer.data(), readBuffer.size(), readMessages))
+            {
+                // Stop watching the client but leave its socket writable: messages
+                // still queued hold the connection open until their ACKs are sent
+                epoll_ctl(epollFd, EPOLL_CTL_DEL, fd, nullptr);
+                std::cout << "Connection closed for " << it->second->getClientId() << std::endl;
+                connections.erase(it);
+            }
         }
-    }
 
-    // Cleanup
-    {
-        std::lock_guard<std::mutex> lock(socketMapMutex);
-        clientSocketMap.erase(clientId);
+        messageQueue.pushBatch(readMessages);
     }
-    close(clientSocket);
-    std::cout << "Worker thread exited for " << clientId << std::endl;
+
+    // Dropping the map closes idle clients right away; clients with queued
+    // messages stay open until the consumer has sent their ACKs
+    connections.clear();
+
+    close(epollFd);
 }
 
 // Signal handler for graceful shutdown
+// Only async-signal-safe work here: the event loop does the actual shutdown
 void signalHandler(int signum)
 {
-    std::cout << "\nReceived signal " << signum << ", shutting down..." << std::endl;
+    receivedSignal = signum;
     isServerRunning = false;
-    messageQueue.shutdownQueue();
+
+    uint64_t one = 1;
+    ssize_t ignored = write(shutdownEventFd, &one, sizeof(one));
+    (void)ignored;
 }
 
 /* Main function */
 int main()
 {
+    shutdownEventFd = eventfd(0, EFD_CLOEXEC | EFD_NONBLOCK);
+    if (shutdownEventFd < 0)
+    {
+        std::cerr << "Failed to create eventfd: " << strerror(errno) << std::endl;
+        return 1;
+    }
+
     // Set up signal handlers for graceful shutdown
     signal(SIGINT, signalHandler);
     signal(SIGTERM, signalHandler);
 
-    int serverSocket = socket(AF_INET, SOCK_STREAM, 0);
+    // Non-blocking so a loop that loses the race for a connection gets EAGAIN instead of stalling
+    int serverSocket = socket(AF_INET, SOCK_STREAM | SOCK_NONBLOCK | SOCK_CLOEXEC, 0);
     if (serverSocket < 0)
     {
         std::cerr << "Failed to create socket: " << strerror(errno) << std::endl;
@@ -261,6 +669,15 @@ int main()
         return 1;
     }
 
+    // Set before listen() so every accepted socket inherits the buffers and
+    // the TCP window scale is negotiated to match
+    int bufferSize = SOCKET_BUFFER_SIZE;
+    if (setsockopt(serverSocket, SOL_SOCKET, SO_RCVBUF, &bufferSize, sizeof(bufferSize)) < 0 ||
+        setsockopt(serverSocket, SOL_SOCKET, SO_SNDBUF, &bufferSize, sizeof(bufferSize)) < 0)
+    {
+        std::cerr << "Failed to size socket buffers: " << strerror(errno) << std::endl;
+    }
+
     sockaddr_in serverAddr{};
     serverAddr.sin_family = AF_INET;
     serverAddr.sin_port = htons(9090);
@@ -273,7 +690,9 @@ int main()
         return 1;
     }
 
-    if (listen(serverSocket, 10) < 0)
+    // A deep backlog lets a burst of simultaneous connects queue in the kernel
+    // instead of being dropped and retried
+    if (listen(serverSocket, SOMAXCONN) < 0)
     {
         std::cerr << "Listen failed: " << strerror(errno) << std::endl;
         close(serverSocket);
@@ -285,56 +704,31 @@ int main()
     std::cout << "Server listening on port 9090..." << std::endl;
     std::cout << "Press Ctrl+C to stop the server" << std::endl;
 
-    while (isServerRunning)
-    {
-        // Set timeout for accept to allow checking isServerRunning
-        struct timeval tv;
-        tv.tv_sec = 1;
-        tv.tv_usec = 0;
-        setsockopt(serverSocket, SOL_SOCKET, SO_RCVTIMEO, &tv, sizeof(tv));
-
-        int clientSocket = accept(serverSocket, nullptr, nullptr);
-
-        if (clientSocket < 0)
-        {
-            if (errno == EAGAIN || errno == EWOULDBLOCK)
-            {
-                // Timeout, continue loop to check isServerRunning
-                continue;
-            }
-            if (!isServerRunning)
-            {
-                break; // Server is shutting down
-            }
-            std::cerr << "Error accepting connection: " << strerror(errno) << std::endl;
-            continue;
-        }
+    unsigned int loopCount = std::max(1u, std::thread::hardware_concurrency());
+    std::cout << "Starting " << loopCount << " event loop threads" << std::endl;
 
-        std::string clientId = "client-" + std::to_string(clientCounter++);
-        std::cout << "New connection: " << clientId << std::endl;
+    std::vector<std::thread> eventLoops;
+    for (unsigned int i = 0; i < loopCount; ++i)
+    {
+        eventLoops.emplace_back(eventLoop, serverSocket);
+    }
 
-        {
-            std::lock_guard<std::mutex> lock(socketMapMutex);
-            clientSocketMap[clientId] = clientSocket;
-        }
+    for (auto &loop : eventLoops)
+    {
+        loop.join();
+    }
 
-        std::thread(workerThread, clientSocket, clientId).detach();
+    if (receivedSignal)
+    {
+        std::cout << "\nReceived signal " << receivedSignal << ", shutting down..." << std::endl;
     }
+    messageQueue.shutdownQueue();
 
     // Cleanup
     std::cout << "Shutting down server..." << std::endl;
 
-    // Close all client sockets
-    {
-        std::lock_guard<std::mutex> lock(socketMapMutex);
-        for (auto &pair : clientSocketMap)
-        {
-            close(pair.second);
-        }
-        clientSocketMap.clear();
-    }
-
     close(serverSocket);
+    close(shutdownEventFd);
 
     // Wait for consumer thread to finish
     if (consumer.joinable())